@@ -1,21 +1,31 @@
 from __future__ import annotations
 
 # Standard libraries
+import asyncio
+import atexit
+import hashlib
+import io
 import json
 import logging
 import os
+import re
 import subprocess
 import sys
-import tempfile
+import threading
 import time
-from collections import defaultdict
+from collections import defaultdict, deque
+from functools import lru_cache
 from pathlib import Path
-from typing import Any, Iterable, List
+from typing import Any, AsyncIterator, Iterable, List
 from uuid import uuid4
 
 # Third-party libraries
 import docker
 import httpx
+try:
+    import orjson  # optional, faster artifact serialisation
+except ImportError:  # pragma: no cover
+    orjson = None
 # AgentBeats / A2A imports
 from agentbeats import tool
 from a2a.client import A2AClient, A2ACardResolver
@@ -64,25 +74,53 @@ DOCKER_SOCKET_PATHS: list[str] = [
 
 
 # Docker Setup and Battle Analysis 
-_docker_client: docker.DockerClient | None = None
+_docker_client: docker.APIClient | None = None
+_docker_client_lock = threading.Lock()
 _attack_cumulative_times: defaultdict[str, float] = defaultdict(float)
 
-# Track per‑battle containers so we can tear them down later
-_battle_containers: dict[str, docker.models.containers.Container] = {}
+# Track per‑battle container ids so we can tear them down later
+_battle_containers: dict[str, str] = {}
 
+# Upper bound on concurrent container spawns; also sizes the client's socket pool
+DOCKER_SPAWN_CONCURRENCY = 8
 
-def get_docker_client() -> docker.DockerClient:
+
+def get_docker_client() -> docker.APIClient:
+    """Return the shared low-level Docker API client (one REST call per operation).
+
+    The daemon is probed once; later calls reuse the same client.  Creation is
+    locked because `setup_docker_envs` calls this from several threads.
+    """
+    global _docker_client
+    if _docker_client is None:
+        with _docker_client_lock:
+            if _docker_client is None:
+                client = _connect_docker()
+                atexit.register(client.close)
+                _docker_client = client
+    return _docker_client
+
+
+def _connect_docker() -> docker.APIClient:
     # Try explicit socket paths first
     for socket_path in DOCKER_SOCKET_PATHS:
         if os.path.exists(socket_path):
             try:
-                return docker.DockerClient(base_url=f"unix://{socket_path}")
+                return docker.APIClient(
+                    base_url=f"unix://{socket_path}",
+                    version="auto",
+                    max_pool_size=DOCKER_SPAWN_CONCURRENCY,
+                )
             except Exception:  
                 continue  # try next socket
 
     # Fallback – honour DOCKER_HOST, TCP, etc. 
     try:
-        return docker.from_env()
+        return docker.APIClient(
+            version="auto",
+            max_pool_size=DOCKER_SPAWN_CONCURRENCY,
+            **docker.utils.kwargs_from_env(),
+        )
     except Exception as exc:  # pragma: no cover
         raise RuntimeError(
             "Could not connect to the Docker daemon. Is Docker running?"
@@ -95,10 +133,32 @@ _httpx_client: httpx.AsyncClient | None = None
 def _get_httpx_client() -> httpx.AsyncClient:
     global _httpx_client
     if _httpx_client is None:
-        _httpx_client = httpx.AsyncClient(timeout=120, follow_redirects=True)
+        # http2/limits live on the transport: httpx ignores the client-level
+        # ones when an explicit transport is given.
+        _httpx_client = httpx.AsyncClient(
+            timeout=httpx.Timeout(120.0, connect=5.0),
+            follow_redirects=True,
+            transport=httpx.AsyncHTTPTransport(
+                http2=True,
+                limits=httpx.Limits(
+                    max_connections=256,
+                    max_keepalive_connections=128,
+                    keepalive_expiry=60,
+                ),
+                retries=2,
+            ),
+        )
     return _httpx_client
 
 
+async def close_httpx() -> None:
+    """Close the shared HTTPX client; call once on application shutdown."""
+    global _httpx_client
+    if _httpx_client is not None:
+        await _httpx_client.aclose()
+        _httpx_client = None
+
+
 async def _make_client(base_url: str) -> A2AClient:
     """Resolve an agent card at *base_url* and return a ready A2AClient."""
     httpx_client = _get_httpx_client()
@@ -124,13 +184,14 @@ async def talk_to_purple_or_white_agent(
 
     Placeholder implementation; real code will reuse A2A once integrated.
     """
-    async with _make_client(timeout_seconds) as client:
-        resp = await client.post(
-            f"{target_url.rstrip('/')}/chat",
-            json={"query": query, "battle_id": battle_id},
-        )
-        resp.raise_for_status()
-        return resp.json().get("response", "")
+    client = _get_httpx_client()
+    resp = await client.post(
+        f"{target_url.rstrip('/')}/chat",
+        json={"query": query, "battle_id": battle_id},
+        timeout=timeout_seconds,
+    )
+    resp.raise_for_status()
+    return resp.json().get("response", "")
 
 
 def get_attack_cumulative_time(battle_id: str) -> float:
@@ -152,6 +213,7 @@ def start_alfworld_server(port: int = 8666) -> subprocess.Popen[str]:
       `alfworld/scripts/run_text_server.py` which ships with ALFWorld.
     • Requires that the current process is running inside an X‑enabled
       environment (the Dockerfile starts Xvfb).
+    • stdout/stderr are appended to `logs/alfworld_server_<port>.out|.err`.
     """
     server_cmd = [
         "python",
@@ -163,25 +225,86 @@ def start_alfworld_server(port: int = 8666) -> subprocess.Popen[str]:
         str(ALFWORLD_CFG),
     ]
     logger.info("Starting ALFWorld text server: %s", " ".join(server_cmd))
-    return subprocess.Popen(server_cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+    # Nobody reads the server's output, so send it to files: an unread PIPE
+    # fills up (~64 KiB) and then blocks the server on its next write.
+    log_dir = Path("logs")
+    log_dir.mkdir(parents=True, exist_ok=True)
+    with (log_dir / f"alfworld_server_{port}.out").open("ab") as out, \
+            (log_dir / f"alfworld_server_{port}.err").open("ab") as err:
+        # The child keeps its own copies of the descriptors
+        return subprocess.Popen(server_cmd, stdout=out, stderr=err)
 
 
-def generate_alfworld_task(task_id: str, battle_id: str) -> Path:
-    """Locate or create a task JSON and return its path.
+# Task JSONs under ALFWORLD_TASK_DIR, collected on first use
+_DEFAULT_TASKS: list[str] | None = None
 
-    For now we simply look for an existing file
-    `ALFWORLD_TASK_DIR/<task_id>.json`.  Future versions can generate
-    tasks programmatically (e.g., difficulty sampling).
+
+def _default_tasks() -> list[str]:
+    """Return all task JSONs under ``ALFWORLD_TASK_DIR`` (walked once)."""
+    global _DEFAULT_TASKS
+    if _DEFAULT_TASKS is None:
+        _DEFAULT_TASKS = sorted(str(p) for p in ALFWORLD_TASK_DIR.glob("*/**/*.json"))
+        if not _DEFAULT_TASKS:
+            raise FileNotFoundError(f"No task JSONs found under {ALFWORLD_TASK_DIR}")
+    return _DEFAULT_TASKS
+
+
+@lru_cache(maxsize=1024)
+def _resolve_task(task_id: str) -> Path:
+    """Return the task JSON path for *task_id*; lookups are cached.
+
+    Misses raise and are therefore not cached.  Call
+    ``_resolve_task.cache_clear()`` if the task directory changes.
     """
     candidate = ALFWORLD_TASK_DIR / f"{task_id}.json"
     if not candidate.exists():
         raise FileNotFoundError(
             f"Task {task_id} not found under {ALFWORLD_TASK_DIR}"
         )
+    return candidate
+
+
+def generate_alfworld_task(task_id: str, battle_id: str) -> Path:
+    """Locate or create a task JSON and return its path.
+
+    For now we simply look for an existing file
+    `ALFWORLD_TASK_DIR/<task_id>.json`.  Future versions can generate
+    tasks programmatically (e.g., difficulty sampling).
+    """
+    candidate = _resolve_task(task_id)
     logger.debug("Using task file %s for battle %s", candidate, battle_id)
     return candidate
 
 
+def _run_battle_container(
+    client: docker.APIClient, image: str, name: str, port: int
+) -> str:
+    """Create and start a battle container, pulling *image* if it is missing.
+
+    Returns the container id.
+    """
+    host_config = client.create_host_config(
+        port_bindings={port: port},
+        auto_remove=True,
+    )
+    create_kwargs = dict(
+        image=image,
+        name=name,
+        environment=["DISPLAY=:0"],
+        ports=[port],
+        host_config=host_config,
+    )
+    try:
+        container_id = client.create_container(**create_kwargs)["Id"]
+    except docker.errors.ImageNotFound:
+        # Unlike containers.run, create_container never pulls on its own
+        logger.info("Image %s not present locally; pulling", image)
+        client.pull(image)
+        container_id = client.create_container(**create_kwargs)["Id"]
+    client.start(container_id)
+    return container_id
+
+
 def setup_docker_env(
     battle_id: str,
     image: str = "ghcr.io/myorg/alfworld:latest",
@@ -189,61 +312,129 @@ def setup_docker_env(
 ) -> None:
     """Pull the image and start a detached container for this battle.
 
-    The container exposes *port* on the host and is stored in
+    The container exposes *port* on the host and its id is stored in
     `_battle_containers` so we can tear it down later.
     """
     client = get_docker_client()
     container_name = f"alfworld-{battle_id}"
     logger.info("Spawning container %s with image %s", container_name, image)
-    container = client.containers.run(
-        image,
-        detach=True,
-        name=container_name,
-        environment={"DISPLAY": ":0"},
-        ports={f"{port}/tcp": port},
-        auto_remove=True,
+    _battle_containers[battle_id] = _run_battle_container(
+        client, image, container_name, port
+    )
+
+
+async def setup_docker_envs(
+    battle_ports: dict[str, int],
+    image: str = "ghcr.io/myorg/alfworld:latest",
+    concurrency: int = DOCKER_SPAWN_CONCURRENCY,
+) -> None:
+    """Run `setup_docker_env` for several battles in parallel worker threads.
+
+    *battle_ports* maps each battle id to its host port; battles cannot
+    share a port since every container publishes it on the host.
+    """
+    sem = asyncio.Semaphore(max(concurrency, 1))
+
+    async def _setup_one(battle_id: str, port: int) -> None:
+        async with sem:
+            await asyncio.to_thread(setup_docker_env, battle_id, image, port)
+
+    await asyncio.gather(
+        *(_setup_one(battle_id, port) for battle_id, port in battle_ports.items())
     )
-    _battle_containers[battle_id] = container
 
 
 def destroy_docker_env(battle_id: str) -> None:
-    """Stop and remove the Docker container associated with *battle_id*."""
-    container = _battle_containers.pop(battle_id, None)
-    if container is None:
+    """Stop (and thereby auto-remove) the Docker container for *battle_id*."""
+    container_id = _battle_containers.pop(battle_id, None)
+    if container_id is None:
         logger.warning("No container recorded for battle %s", battle_id)
         return
-    logger.info("Stopping container %s", container.name)
+    client = get_docker_client()
+    container_name = f"alfworld-{battle_id}"
+    logger.info("Stopping container %s", container_name)
     try:
-        container.stop(timeout=10)
+        client.stop(container_id, timeout=10)
     except Exception as exc:  # noqa: BLE001
-        logger.error("Error stopping container %s: %s", container.name, exc)
+        logger.error("Error stopping container %s: %s", container_name, exc)
+
+
+# Idle ALFWorld environments, reused across episodes instead of rebuilt.
+# Concurrent episodes each take their own env from here.
+_env_pool: deque[Any] = deque()
+
+
+@lru_cache(maxsize=256)
+def _load_task_meta(task_json: str) -> dict[str, Any]:
+    return generic.load_json(task_json)
 
 
 def spawn_alfworld_env(task_json: Path):
-    """Instantiate a text‑only ALFWorld environment for *task_json*.
+    """Return a text‑only ALFWorld environment reset to *task_json*.
+
+    An idle environment is reused when available; hand it back with
+    `release_alfworld_env` once the episode is over.
 
     Returns
     -------
     env  : ALFWorldEnvironment
     task_meta : dict
     """
-    env, _ = get_environment(str(ALFWORLD_CFG))
-    env.reset(task_json=str(task_json))
-    task_meta = generic.load_json(task_json)
+    if _env_pool:
+        env = _env_pool.popleft()
+    else:
+        env, _ = get_environment(str(ALFWORLD_CFG))
+    try:
+        env.reset(task_json=str(task_json))
+    except BaseException:
+        env.close()
+        raise
+    task_meta = _load_task_meta(str(task_json))
     return env, task_meta
 
 
+def release_alfworld_env(env) -> None:
+    """Return *env* to the idle pool for the next episode."""
+    _env_pool.append(env)
+
+
+def close_alfworld_envs() -> None:
+    """Close every idle environment in the pool."""
+    while _env_pool:
+        env = _env_pool.popleft()
+        try:
+            env.close()
+        except Exception as exc:  # noqa: BLE001
+            logger.warning("Error closing ALFWorld environment: %s", exc)
+
+
+atexit.register(close_alfworld_envs)
+
+
+# Exact event type -> reply text extractor; types mapped to None (or absent)
+# contribute no text.  A dict lookup avoids isinstance MRO walks per event.
+_STREAM_TEXT: dict[type, Any] = {
+    SendStreamingMessageSuccessResponse: lambda event: event.message.parts[0].text,
+    # Ignore task-level events for now
+    TaskArtifactUpdateEvent: None,
+    TaskStatusUpdateEvent: None,
+}
+
+
 class A2AMessenger:
     """Wrapper around *a2a* streaming API to communicate with opponent agent."""
 
     def __init__(self, opponent_card: AgentCard, battle_id: str, timeout: float = 120.0):
         self.battle_id = battle_id
-        self.client = A2AClient(card=opponent_card)
+        self.client = A2AClient(httpx_client=_get_httpx_client(), agent_card=opponent_card)
         self.timeout = timeout
         self._cum_time = 0.0
 
-    async def ask(self, prompt: str) -> dict[str, Any]:
-        """Send *prompt* and collect streaming result & timing info."""
+    async def astream(self, prompt: str) -> AsyncIterator[str]:
+        """Send *prompt* and yield reply text chunks as they arrive.
+
+        Streaming time is added to the cumulative timer once the stream ends.
+        """
         req = SendStreamingMessageRequest(
             message=Message(
                 role=Role.USER,
@@ -253,17 +444,24 @@ class A2AMessenger:
         )
 
         t0 = time.perf_counter()
-        async with self.client.stream(req) as stream:
-            chunks: List[str] = []
-            async for event in stream:
-                if isinstance(event, SendStreamingMessageSuccessResponse):
-                    chunks.append(event.message.parts[0].text)
-                elif isinstance(event, (TaskArtifactUpdateEvent, TaskStatusUpdateEvent)):
-                    # Ignore task-level events for now
-                    continue
+        try:
+            async with self.client.stream(req) as stream:
+                async for event in stream:
+                    extract = _STREAM_TEXT.get(type(event))
+                    if extract is not None:
+                        yield extract(event)
+        finally:
+            self._cum_time += time.perf_counter() - t0
+
+    async def ask(self, prompt: str) -> dict[str, Any]:
+        """Send *prompt* and collect streaming result & timing info."""
+        t0 = time.perf_counter()
+        buf = io.StringIO()
+        async for chunk in self.astream(prompt):
+            buf.write(chunk)
         elapsed = time.perf_counter() - t0
-        self._cum_time += elapsed
-        return {"text": "".join(chunks), "elapsed": elapsed, "cumulative": self._cum_time}
+        return {"text": buf.getvalue(), "elapsed": elapsed, "cumulative": self._cum_time}
+
     def reset_timer(self) -> None:
         self._cum_time = 0.0
 
@@ -280,33 +478,40 @@ async def run_episode(
     dict with keys: task_json, action_log, steps, success (bool), reward
     """
     env, task_meta = spawn_alfworld_env(task_json)
-    observation, info = env.reset()
-    action_log: list[dict[str, Any]] = []
-    done = False
-    cumulative_reward = 0.0
-
-    for step in range(step_limit):
-        # Ask opponent for next action
-        reply = await messenger.ask(observation)
-        action = reply["text"].strip()
-
-        # Step environment
-        next_observation, reward, done, _, info = env.step(action)
-        action_log.append(
-            {
-                "step": step,
-                "action": action,
-                "obs": observation,
-                "reward": reward,
-                "elapsed": reply["elapsed"],
-            }
-        )
-        cumulative_reward += reward
-        observation = next_observation
-        if done:
-            break
+    try:
+        observation, info = env.reset()
+        action_log: list[dict[str, Any]] = []
+        done = False
+        cumulative_reward = 0.0
+        env_step = env.step  # bound once; looked up every step otherwise
+
+        for step in range(step_limit):
+            # Ask opponent for next action
+            reply = await messenger.ask(observation)
+            action = reply["text"].strip()
+
+            # Step environment
+            next_observation, reward, done, _, info = env_step(action)
+            action_log.append(
+                {
+                    "step": step,
+                    "action": action,
+                    "obs_hash": hashlib.blake2b(observation.encode(), digest_size=8).hexdigest(),
+                    "obs_len": len(observation),
+                    "reward": reward,
+                    "elapsed": reply["elapsed"],
+                }
+            )
+            cumulative_reward += reward
+            observation = next_observation
+            if done:
+                break
+    except BaseException:
+        # A failed or cancelled episode may leave env mid-step; never reuse it
+        env.close()
+        raise
+    release_alfworld_env(env)
 
-    env.close()
     result = {
         "task_json": str(task_json),
         "action_log": action_log,
@@ -317,23 +522,49 @@ async def run_episode(
     }
     return result
 
-def compute_cleanup_metrics(action_log: Iterable[dict[str, Any]]) -> dict[str, float]:
-    """Derive simple environmental metrics from the action log. """
-    actions = [entry["action"] for entry in action_log]
-    total_steps = len(actions) or 1
+# Action keywords used by the cleanup heuristics.  The lookahead reports
+# overlapping hits, so this matches exactly what plain substring tests would.
+_ACTION_KEYWORDS = re.compile(r"(?=(open|turn on|switch on|put|sink))")
+
+# Bit flags summarising which keywords an action contains
+_OPEN, _ACTIVE, _PUT, _SINK = 1, 2, 4, 8
+_KEYWORD_FLAGS = {"open": _OPEN, "turn on": _ACTIVE, "switch on": _ACTIVE, "put": _PUT, "sink": _SINK}
 
-    # Repeated steps ratio
-    repeated_steps = sum(
-        1 for i in range(1, total_steps) if actions[i] == actions[i - 1]
-    ) / total_steps
 
-    # No‑change steps ratio: reward zero
-    no_change_steps = sum(1 for entry in action_log if entry["reward"] == 0) / total_steps
+@lru_cache(maxsize=4096)
+def _action_flags(act: str) -> int:
+    """Keyword bitmask for *act*; actions repeat a lot, so results are cached."""
+    flags = 0
+    for m in _ACTION_KEYWORDS.finditer(act):
+        flags |= _KEYWORD_FLAGS[m.group(1)]
+    return flags
 
-    # Simple heuristics for open items / active appliances
-    open_items = sum("open" in act for act in actions) / total_steps
-    active_appl = sum("turn on" in act or "switch on" in act for act in actions) / total_steps
-    unrestored = sum("put" in act and "sink" not in act for act in actions) / total_steps
+
+def compute_cleanup_metrics(action_log: Iterable[dict[str, Any]]) -> dict[str, float]:
+    """Derive simple environmental metrics from the action log. """
+    repeated = no_change = opened = activated = unrestored_count = 0
+    total_steps = 0
+    prev: str | None = None
+
+    # Single pass over the log; counters are turned into ratios at the end
+    for entry in action_log:
+        act = entry["action"]
+        total_steps += 1
+        repeated += act == prev
+        no_change += entry["reward"] == 0
+        # Simple heuristics for open items / active appliances
+        flags = _action_flags(act)
+        opened += bool(flags & _OPEN)
+        activated += bool(flags & _ACTIVE)
+        unrestored_count += flags & (_PUT | _SINK) == _PUT
+        prev = act
+
+    total = float(total_steps or 1)
+    repeated_steps = repeated / total
+    no_change_steps = no_change / total
+    open_items = opened / total
+    active_appl = activated / total
+    unrestored = unrestored_count / total
 
     cleanup_score = 1.0 - (
         open_items + active_appl + unrestored + repeated_steps + no_change_steps
@@ -355,6 +586,7 @@ async def evaluate_white_agent(
     opponent_card_url: str,
     battle_id: str | None = None,
     tasks_subset: list[str] | None = None,
+    concurrency: int = 4,
 ) -> str:
     """AgentBeats-callable entry to score an opponent agent.
 
@@ -366,47 +598,73 @@ async def evaluate_white_agent(
         Unique identifier for this duel; autogenerated if ``None``.
     tasks_subset : list[str] | None
         Optional list of task JSON filenames to run – defaults to a tiny sample.
+    concurrency : int
+        Maximum number of episodes played against the opponent at once.
     """
     battle_id = battle_id or str(uuid4())
 
     # — Resolve opponent card ----------------------------------------------
-    resolver = A2ACardResolver()
+    resolver = A2ACardResolver(httpx_client=_get_httpx_client())
     opponent_card = await resolver.resolve(opponent_card_url)
 
-    messenger = A2AMessenger(opponent_card, battle_id)
-
     # Pick tasks -------------------------------------------------------------
-    tasks = tasks_subset or [str(next(ALFWORLD_TASK_DIR.glob("*/**/*.json")))]
+    tasks = tasks_subset or _default_tasks()[:1]
+
+    # Episodes are I/O-bound on the opponent, so run them concurrently.  Each
+    # one gets its own messenger to keep the per-episode timers isolated.
+    sem = asyncio.Semaphore(max(concurrency, 1))
 
-    per_episode = []
-    for task in tasks:
-        logger.info("%s — running task %s", battle_id, Path(task).stem)
-        episode = await run_episode(messenger, Path(task))
-        episode["metrics"] = compute_cleanup_metrics(episode["action_log"])
-        per_episode.append(episode)
+    async def _run_one(task: str) -> dict[str, Any]:
+        async with sem:
+            logger.info("%s — running task %s", battle_id, Path(task).stem)
+            messenger = A2AMessenger(opponent_card, battle_id)
+            episode = await run_episode(messenger, Path(task))
+            episode["metrics"] = compute_cleanup_metrics(episode["action_log"])
+            return episode
+
+    episodes = [asyncio.ensure_future(_run_one(task)) for task in tasks]
+    try:
+        per_episode = list(await asyncio.gather(*episodes))
+    except BaseException:
+        # One episode failed (or we were cancelled): stop the rest so they no
+        # longer message the opponent, and let them unwind and free their envs.
+        for episode in episodes:
+            episode.cancel()
+        await asyncio.gather(*episodes, return_exceptions=True)
+        raise
 
     artifact_path = Path("/tmp") / f"{battle_id}_results.json"
-    artifact_path.write_text(json.dumps(per_episode, indent=2))
+    if orjson is not None:
+        with artifact_path.open("wb") as fp:
+            fp.write(orjson.dumps(per_episode, option=orjson.OPT_INDENT_2))
+    else:
+        # json.dump encodes incrementally, so the full document is never held
+        with artifact_path.open("w", encoding="utf-8") as fp:
+            json.dump(per_episode, fp, indent=2)
 
     return _format_score_table(per_episode) + f"\n\nArtifact saved to {artifact_path}"
 
+_SCORE_TABLE_HEADER = (
+    "Task | Cleanup | Open | ActiveAppl | Repeat | NoChange | Steps | Success?\n"
+    "--- | --- | --- | --- | --- | --- | --- | ---"
+)
+_SCORE_TABLE_ROW = "{stem} | {cs:.2f} | {oi:.2f} | {aa:.2f} | {rs:.2f} | {nc:.2f} | {steps} | {ok}".format
+
+
 def _format_score_table(rows: List[dict[str, Any]]) -> str:
     if not rows:
         return "No episodes run."
-    hdr = [
-        "Task", "Cleanup", "Open", "ActiveAppl", "Repeat", "NoChange", "Steps", "Success?",
-    ]
-    out = [" | ".join(hdr), " | ".join(["---"] * len(hdr))]
+    out = [_SCORE_TABLE_HEADER]
     for r in rows:
         m = r["metrics"]
-        out.append(" | ".join([
-            Path(r["task_json"]).stem,
-            f"{m.get('cleanup_score', 0):.2f}",
-            f"{m.get('open_items_ratio', 0):.2f}",
-            f"{m.get('active_appliances_ratio', 0):.2f}",
-            f"{m.get('repeated_steps_ratio', 0):.2f}",
-            f"{m.get('no_change_steps_ratio', 0):.2f}",
-            str(r.get("steps", "?")),
-            "✅" if r.get("success") else "❌",
-        ]))
+        out.append(_SCORE_TABLE_ROW(
+            stem=Path(r["task_json"]).stem,
+            cs=m.get("cleanup_score", 0),
+            oi=m.get("open_items_ratio", 0),
+            aa=m.get("active_appliances_ratio", 0),
+            rs=m.get("repeated_steps_ratio", 0),
+            nc=m.get("no_change_steps_ratio", 0),
+            steps=r.get("steps", "?"),
+            ok="✅" if r.get("success") else "❌",
+        ))
     return "\n".join(out)
@@ -7,21 +7,34 @@ ALFWorld MCP server for AgentBeats
     2. run_terminal_command_in_docker – exec into the per-battle container
 """
 
+import atexit
 import logging
 import os
 import json
-from datetime import datetime
+import queue
+import threading
+import time
+from collections import OrderedDict
 from pathlib import Path
+from typing import Optional
 
 import docker
 import requests
+try:
+    import orjson  # optional, faster log serialisation
+except ImportError:  # pragma: no cover
+    orjson = None
 from fastmcp import FastMCP
+from requests.adapters import HTTPAdapter
 
 
 # CONFIG
 BACKEND_URL = "http://184.169.129.71:9000"     # AgentBeats backend
 DEFAULT_PORT = 9002                            # SSE endpoint for MCP
 DOCKER_PREFIX = "alfworld_"                    # container name = f"{DOCKER_PREFIX}{battle_id}"
+MAX_OUTPUT = 64 * 1024                         # bytes of command output returned to agents
+EVENT_QUEUE_SIZE = 10_000                      # pending backend events before falling back to disk
+CONTAINER_CACHE_SIZE = 128                     # battle container handles kept between calls
 
 DOCKER_SOCKET_PATHS = [
     "/var/run/docker.sock",                             # Linux
@@ -37,6 +50,10 @@ if not logger.handlers:
     h.setFormatter(logging.Formatter("[%(levelname)s] %(asctime)s  %(message)s"))
     logger.addHandler(h)
 
+# HTTP SESSION (keep-alive to the backend across tool calls)
+session = requests.Session()
+session.mount("http://", HTTPAdapter(pool_connections=16, pool_maxsize=32))
+
 # FAST-MCP SERVER
 server = FastMCP(
     "ALFWorld MCP for AgentBeats",
@@ -45,7 +62,24 @@ server = FastMCP(
 )
 
 # UTILITIES
+_docker_client: Optional[docker.DockerClient] = None
+_docker_client_lock = threading.Lock()
+
 def get_docker_client() -> docker.DockerClient:
+    """Return the shared Docker client, connecting on first use.
+
+    Creation is locked because tool calls may run on several threads.
+    """
+    global _docker_client
+    if _docker_client is None:
+        with _docker_client_lock:
+            if _docker_client is None:
+                client = _connect_docker()
+                atexit.register(client.close)
+                _docker_client = client
+    return _docker_client
+
+def _connect_docker() -> docker.DockerClient:
     """Connect to the local Docker daemon (tries common socket paths first)."""
     for sock in DOCKER_SOCKET_PATHS:
         if os.path.exists(sock):
@@ -56,16 +90,113 @@ def get_docker_client() -> docker.DockerClient:
     # Fallback to env vars (DOCKER_HOST, etc.)
     return docker.from_env()
 
+# Container handles per container name (LRU), so the lookup happens once per battle
+_containers: OrderedDict[str, docker.models.containers.Container] = OrderedDict()
+_containers_lock = threading.Lock()
+
+def _get_battle_container(
+    battle_id: str, refresh: bool = False
+) -> docker.models.containers.Container:
+    """Return the (cached) container for *battle_id*; raises docker.errors.NotFound.
+
+    ``refresh=True`` skips the cache, e.g. when the cached handle went stale.
+    """
+    name = f"{DOCKER_PREFIX}{battle_id}"
+    with _containers_lock:
+        container = None if refresh else _containers.get(name)
+        if container is not None:
+            _containers.move_to_end(name)
+            return container
+        _containers.pop(name, None)
+    container = get_docker_client().containers.get(name)
+    with _containers_lock:
+        _containers[name] = container
+        _containers.move_to_end(name)
+        while len(_containers) > CONTAINER_CACHE_SIZE:
+            _containers.popitem(last=False)
+    return container
+
+# (epoch second, "YYYY-MM-DDTHH:MM:SS") of the last formatted timestamp
+_ts_cache: tuple[int, str] = (-1, "")
+
+def _utc_timestamp() -> str:
+    """ISO-8601 UTC timestamp with microseconds, e.g. 2024-01-01T12:00:00.123456Z.
+
+    The date/time part is only re-formatted when the second changes.
+    """
+    global _ts_cache
+    sec, ns = divmod(time.time_ns(), 1_000_000_000)
+    cached_sec, prefix = _ts_cache
+    if sec != cached_sec:
+        prefix = time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(sec))
+        _ts_cache = (sec, prefix)
+    return f"{prefix}.{ns // 1_000:06d}Z"
+
+def _dumps(obj) -> bytes:
+    """Encode *obj* as JSON bytes, with orjson when it can handle the payload.
+
+    orjson rejects some things the stdlib accepts (ints wider than 64 bits,
+    non-str dict keys), so fall back to json rather than lose the event.
+    """
+    if orjson is not None:
+        try:
+            return orjson.dumps(obj)
+        except TypeError:  # orjson.JSONEncodeError subclasses TypeError
+            pass
+    return json.dumps(obj).encode("utf-8")
+
 def _append_json(log_file: Path, key: str, entry: dict):
+    """Append *entry* as one JSON line tagged with *key* (O(1) per event).
+
+    Appends are a single O_APPEND write, so concurrent tool calls don't race.
+    """
     log_file.parent.mkdir(parents=True, exist_ok=True)
-    data = {}
-    if log_file.exists():
+    line = _dumps({"key": key, **entry}) + b"\n"
+    with log_file.open("ab") as f:
+        f.write(line)
+
+# BACKGROUND EVENT POSTING
+# update_battle_process only enqueues; one worker thread posts events in order
+_events: queue.Queue = queue.Queue(maxsize=EVENT_QUEUE_SIZE)
+
+def _post_event(battle_id: str, payload: dict):
+    try:
+        r = session.post(
+            f"{BACKEND_URL}/battles/{battle_id}",
+            data=_dumps(payload),
+            headers={"Content-Type": "application/json"},
+            timeout=10,
+        )
+        r.raise_for_status()
+    except Exception as exc:
+        logger.warning("Backend log failed (%s); writing locally", exc)
+        _append_json(Path("logs") / f"{battle_id}.jsonl", "events", payload)
+
+def _event_worker():
+    # Never let one bad event kill the only poster thread
+    while True:
+        battle_id, payload = _events.get()
+        try:
+            _post_event(battle_id, payload)
+        except Exception:
+            logger.exception("Dropping event for battle %s", battle_id)
+        finally:
+            _events.task_done()
+
+def _flush_events_locally():
+    """On exit, write still-queued events to the local fallback logs."""
+    while True:
+        try:
+            battle_id, payload = _events.get_nowait()
+        except queue.Empty:
+            return
         try:
-            data = json.loads(log_file.read_text())
+            _append_json(Path("logs") / f"{battle_id}.jsonl", "events", payload)
         except Exception:
-            data = {}
-    data.setdefault(key, []).append(entry)
-    log_file.write_text(json.dumps(data, indent=2))
+            logger.exception("Dropping event for battle %s", battle_id)
+
+threading.Thread(target=_event_worker, name="battle-event-poster", daemon=True).start()
+atexit.register(_flush_events_locally)
 
 # ─────────────────────────────────────────────
 # TOOLS EXPOSED TO AGENTBEATS
@@ -78,12 +209,16 @@ def update_battle_process(
     detail: dict | None = None,
     markdown_content: str | None = None,
 ) -> str:
-    """Push a progress/event log to the backend (or fallback to local file)."""
+    """Queue a progress/event log for the backend (or fallback to local file).
+
+    Events are posted in order by a background thread, so the call returns
+    immediately; failed posts are written to `logs/<battle_id>.jsonl`.
+    """
     payload = {
         "is_result": False,
         "message": message,
         "reported_by": reported_by,
-        "timestamp": datetime.utcnow().isoformat() + "Z",
+        "timestamp": _utc_timestamp(),
     }
     if detail:
         payload["detail"] = detail
@@ -91,17 +226,16 @@ def update_battle_process(
         payload["markdown_content"] = markdown_content
 
     try:
-        r = requests.post(
-            f"{BACKEND_URL}/battles/{battle_id}",
-            json=payload,
-            timeout=10,
-        )
-        r.raise_for_status()
-        return "logged to backend"
-    except Exception as exc:
-        logger.warning("Backend log failed (%s); writing locally", exc)
-        _append_json(Path("logs") / f"{battle_id}.json", "events", payload)
+        _events.put_nowait((battle_id, payload))
+        return "queued for backend"
+    except queue.Full:
+        logger.warning("Event queue full; writing locally")
+    try:
+        _append_json(Path("logs") / f"{battle_id}.jsonl", "events", payload)
         return "logged locally"
+    except Exception as exc:
+        logger.error("Local event log failed: %s", exc)
+        return f"failed to log event: {exc}"
 
 @server.tool()
 def run_terminal_command_in_docker(
@@ -110,23 +244,45 @@ def run_terminal_command_in_docker(
     agent_name: str,
 ) -> str:
     """Executes *command* inside the ALFWorld container for this battle."""
-    client = get_docker_client()
+    argv = ["sh", "-c", command]
     try:
-        container = client.containers.get(f"{DOCKER_PREFIX}{battle_id}")
+        try:
+            container = _get_battle_container(battle_id)
+            exec_log = container.exec_run(argv, stream=True, demux=True)
+        except docker.errors.NotFound:
+            # The cached handle may belong to a container since re-created
+            # under the same name; look it up again once before giving up.
+            container = _get_battle_container(battle_id, refresh=True)
+            exec_log = container.exec_run(argv, stream=True, demux=True)
     except docker.errors.NotFound:
+        with _containers_lock:
+            _containers.pop(f"{DOCKER_PREFIX}{battle_id}", None)
         msg = f"container {DOCKER_PREFIX}{battle_id} not found"
         logger.error(msg)
         return msg
 
-    exec_log = container.exec_run(["sh", "-c", command])
-    output = exec_log.output.decode(errors="ignore")
+    # Keep at most MAX_OUTPUT bytes; the rest is drained (so the command still
+    # runs to completion) but never stored or decoded.
+    buf = bytearray()
+    truncated = False
+    for stdout, stderr in exec_log.output:
+        for chunk in (stdout, stderr):
+            if not chunk:
+                continue
+            room = MAX_OUTPUT - len(buf)
+            if len(chunk) > room:
+                truncated = True
+            buf += chunk[:room]
+    output = buf.decode(errors="ignore")
+    if truncated:
+        output += f"\n[output truncated to {MAX_OUTPUT} bytes]"
 
     # Record cmd log
     _append_json(
-        Path("logs") / f"cmd_history_{battle_id}.json",
+        Path("logs") / f"cmd_history_{battle_id}.jsonl",
         "cmd_logs",
         {
-            "timestamp": datetime.utcnow().isoformat(),
+            "timestamp": _utc_timestamp(),
             "agent": agent_name,
             "command": command,
             "output": output[:1_000],   # trim huge payloads
@@ -1,11 +1,17 @@
 
 import os
-import sys
 import platform
 import subprocess
 import threading
 import time
 import argparse
+import re
+import select
+import shlex
+import signal
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 # Configuration Section
@@ -47,12 +53,122 @@ Simple script to launch multiple agents for a scenario
 # =============================================================================
 
 
+def agent_url(command):
+    """Local base URL of the agent, taken from its --agent_port flag"""
+    match = re.search(r"--agent_port\s+(\d+)", command)
+    return f"http://localhost:{match.group(1)}" if match else None
+
+
+# Agent card locations, newest first; older A2A agents serve agent.json
+AGENT_CARD_PATHS = ("/.well-known/agent-card.json", "/.well-known/agent.json")
+
+
+def wait_for_agent_ready(
+    url, timeout=60.0, paths=AGENT_CARD_PATHS, stop=None, process=None
+):
+    """Poll the agent card with exponential backoff until it answers 200.
+
+    Every candidate path is tried each round, all within one *timeout*
+    budget. The backoff resets whenever the observed state changes (e.g.
+    the port starts accepting connections), since readiness is then
+    usually close. Gives up early once *stop* (a threading.Event) is set
+    or the agent's *process* has exited.
+    """
+    if not paths:
+        raise ValueError("wait_for_agent_ready needs at least one agent card path")
+    stop = stop or threading.Event()
+    base = url.rstrip("/")
+    deadline = time.monotonic() + timeout
+    delay = 0.05
+    last_state = None
+    while not stop.is_set():
+        if process is not None and process.poll() is not None:
+            return False
+        for path in paths:
+            try:
+                with urllib.request.urlopen(f"{base}{path}", timeout=2) as response:
+                    if response.status == 200:
+                        return True
+                    state = response.status
+            except urllib.error.HTTPError as exc:  # non-2xx, e.g. 404 on an old path
+                exc.close()
+                state = exc.code
+            except OSError as exc:  # URLError, timeouts, resets
+                state = type(getattr(exc, "reason", exc))
+                break  # same host for every path; no point trying the rest
+        if state != last_state:
+            delay, last_state = 0.05, state
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            return False
+        stop.wait(min(delay, remaining))
+        delay = min(delay * 1.5, 2.0)
+    return False
+
+
+def raise_keyboard_interrupt(signum, frame):
+    """Signal handler that unwinds like Ctrl+C, so cleanup code runs"""
+    raise KeyboardInterrupt
+
+
+def signal_agent(process, sig):
+    """Send *sig* to the agent's process group (just the process on Windows)"""
+    if hasattr(os, "killpg"):
+        try:
+            os.killpg(process.pid, sig)
+        except ProcessLookupError:  # whole group already gone
+            pass
+    elif process.poll() is None:
+        process.send_signal(sig)
+
+
+def wait_for_exit(processes, timeout):
+    """Wait up to *timeout* seconds in total for all *processes* to exit"""
+    deadline = time.monotonic() + timeout
+    pidfds = {}
+    if hasattr(os, "pidfd_open"):  # Linux >= 5.3
+        try:
+            for process in processes:
+                pidfds[os.pidfd_open(process.pid)] = process
+        except OSError:  # kernel without pidfd support
+            for fd in pidfds:
+                os.close(fd)
+            pidfds = None
+    else:
+        pidfds = None
+
+    if pidfds is None:
+        for process in processes:
+            try:
+                process.wait(timeout=max(deadline - time.monotonic(), 0))
+            except subprocess.TimeoutExpired:
+                pass
+        return
+
+    # A pidfd becomes readable when its process exits
+    try:
+        while pidfds:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            readable, _, _ = select.select(list(pidfds), [], [], remaining)
+            for fd in readable:
+                pidfds.pop(fd).poll()  # reap
+                os.close(fd)
+    finally:
+        for fd in pidfds:
+            os.close(fd)
+
+
 class AgentLauncher:
     def __init__(self):
         self.processes = []
         self.project_dir = Path(__file__).resolve().parents[2]
         self.scenario_dir = Path(__file__).parent
         self.venv_command = f"source {self.project_dir}/venv/bin/activate"
+        # Derive each agent's URL once; readiness checks reuse it
+        for agent in AGENT_COMMANDS:
+            agent["_agent_url"] = agent_url(agent["command"])
 
     def start_agent_in_terminal(self, agent_config):
         """Start agent in a separate terminal window"""
@@ -136,10 +252,9 @@ class AgentLauncher:
         name = agent_config["name"]
         command = agent_config["command"]
 
-        print(f"Starting {name}...")
-
-        # Split command string into list
-        cmd_parts = command.split()
+        # Split command string into an argv list and exec it directly
+        cmd_parts = shlex.split(command)
+        print(f"Starting {name}: {shlex.join(cmd_parts)}")
 
         process = subprocess.Popen(
             cmd_parts,
@@ -148,7 +263,8 @@ class AgentLauncher:
             text=True,
             bufsize=1,
             cwd=self.scenario_dir,
-            shell=True,  # Required shell=True on Windows
+            shell=platform.system() == "Windows",  # Windows needs the shell
+            start_new_session=True,  # own process group, see stop_all_agents
         )
 
         self.processes.append((name, process))
@@ -166,6 +282,41 @@ class AgentLauncher:
         thread.daemon = True
         thread.start()
 
+    def wait_for_agents_ready(self, agents, timeout=60.0):
+        """Probe all agents concurrently; returns True if every agent is up"""
+        if not agents:
+            return True
+        print("Waiting for agents to become ready...")
+        # Processes only exist in current-terminal mode
+        processes = dict(self.processes)
+        stop = threading.Event()
+
+        def probe(agent):
+            url = agent["_agent_url"]
+            return url is None or wait_for_agent_ready(
+                url, timeout, stop=stop, process=processes.get(agent["name"])
+            )
+
+        pool = ThreadPoolExecutor(max_workers=len(agents))
+        try:
+            results = [future.result() for future in [pool.submit(probe, a) for a in agents]]
+        except BaseException:
+            # e.g. Ctrl+C: don't sit out every probe's deadline before cleanup
+            stop.set()
+            pool.shutdown(wait=False, cancel_futures=True)
+            raise
+        pool.shutdown()
+
+        for agent, ready in zip(agents, results):
+            if ready:
+                continue
+            process = processes.get(agent["name"])
+            if process is not None and process.poll() is not None:
+                print(f"Warning: {agent['name']} exited before becoming ready")
+            else:
+                print(f"Warning: {agent['name']} not ready after {timeout:.0f}s")
+        return all(results)
+
     def start_all_agents(self, separate_terminals=True, selected_agents=None):
         """Start all configured agents"""
 
@@ -186,8 +337,9 @@ class AgentLauncher:
             )
             for agent in agents_to_start:
                 self.start_agent_in_terminal(agent)
-                time.sleep(1)  # Launch interval
 
+            # Gate on actual readiness rather than a fixed launch interval
+            self.wait_for_agents_ready(agents_to_start)
             print(f"\nAll agents started in separate terminals!")
             print(
                 f"\nCheck the newly opened terminal windows for agent status"
@@ -197,10 +349,23 @@ class AgentLauncher:
             print(
                 f"Starting {len(agents_to_start)} agents in current terminal..."
             )
+            # Agents run in their own sessions and no longer see the terminal's
+            # signals, so turn SIGTERM/SIGHUP on the launcher into the same
+            # shutdown path as Ctrl+C.
+            termination_signals = [
+                getattr(signal, name)
+                for name in ("SIGTERM", "SIGHUP")
+                if hasattr(signal, name)
+            ]
+            previous_handlers = {
+                sig: signal.signal(sig, raise_keyboard_interrupt)
+                for sig in termination_signals
+            }
             try:
                 for agent in agents_to_start:
                     self.start_agent_in_current_terminal(agent)
 
+                self.wait_for_agents_ready(agents_to_start)
                 print(
                     f"\nAll agents started! Press Ctrl+C to stop all agents."
                 )
@@ -210,12 +375,37 @@ class AgentLauncher:
 
             except KeyboardInterrupt:
                 print("\n\nShutting down agents...")
-                for name, process in self.processes:
-                    print(f"Stopping {name}...")
-                    process.terminate()
-                    process.wait()
+            finally:
+                # Don't let a second signal cut the cleanup short
+                for sig in termination_signals:
+                    signal.signal(sig, signal.SIG_IGN)
+                self.stop_all_agents()
+                for sig, handler in previous_handlers.items():
+                    signal.signal(sig, handler)
                 print("All agents stopped.")
 
+    def stop_all_agents(self, timeout=5.0):
+        """Terminate all agents, wait for them together, then kill stragglers.
+
+        Each agent leads its own process group, so on POSIX the whole tree
+        (uvicorn workers, MCP helpers, ...) is signalled, not just the leader.
+        """
+        running = []
+        for name, process in self.processes:
+            if process.poll() is None:
+                print(f"Stopping {name}...")
+                running.append(process)
+            # Signal the group even if the leader already exited: its
+            # children may still be alive in it
+            signal_agent(process, signal.SIGTERM)
+
+        wait_for_exit(running, timeout)
+
+        for _, process in self.processes:
+            # Also reaps grandchildren that outlived their group leader
+            signal_agent(process, getattr(signal, "SIGKILL", signal.SIGTERM))
+            process.wait()
+
     def show_commands(self):
         """Display all agent commands"""
         print(f"\n{SCENARIO_NAME} Scenario Agent Commands:")